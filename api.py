@@ -14,6 +14,7 @@ from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from services.analysis_client import compare_reports, keyword_analysis, individual_analysis
+from services.incremental_analysis import individual_analysis_incremental
 from services.json_to_pdf_via_latex import write_pdf_from_json_text
 
 
@@ -66,6 +67,7 @@ def run(
     mode: str = Form(...),                       # compare | keywords | individual
     engine: str = Form("tectonic"),              # tectonic | pdflatex
     keywords: str = Form(""),
+    incremental: bool = Form(False),             # individual: reuse unchanged sections
     files: List[UploadFile] = File(...),
 ):
     # Basic validation
@@ -108,7 +110,10 @@ def run(
             generated_pdfs: List[Path] = []
 
             for path in pdf_paths:
-                json_text = individual_analysis([path])
+                if incremental:
+                    json_text = individual_analysis_incremental(path)
+                else:
+                    json_text = individual_analysis([path])
                 basename = f"individual_analysis_{path.stem}"
                 pdf_path = write_pdf_from_json_text(
                     json_text,
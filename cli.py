@@ -5,6 +5,7 @@ from pathlib import Path
 from tqdm import tqdm
 
 from services.analysis_client import compare_reports, keyword_analysis, individual_analysis
+from services.incremental_analysis import individual_analysis_incremental
 from services.json_to_pdf_via_latex import write_pdf_from_json_text
 
 OUT_DIR = Path("./out")
@@ -117,8 +118,15 @@ def home_menu() -> None:
         print(f"Wrote PDF: {pdf}")
 
     elif chosen_task == "3":
+        incremental = input(
+            "Reuse unchanged pages from previous runs? (y/N)\n> "
+        ).strip().lower() == "y"
+
         for path in pdf_paths:
-            json_text = individual_analysis([path])
+            if incremental:
+                json_text = individual_analysis_incremental(path)
+            else:
+                json_text = individual_analysis([path])
             print("Response received. Creating PDF.")
 
             basename = f"individual_analysis_{path.stem}"
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import json
+import time
 from pathlib import Path
 
 from openai import OpenAI
 from tqdm import tqdm
 
+from services.model_router import choose_model, finish_call, routing_meta, start_call
+
 client = OpenAI()
 
 # Project root is one level above /services
@@ -36,22 +40,41 @@ def upload_pdfs(pdf_paths):
     return file_ids
 
 
+def _record_model(output_text: str, model: str, routing: dict) -> str:
+    # Stamp the chosen model into meta so results stay auditable.
+    # Non-JSON output is returned untouched; the PDF writer reports it.
+    try:
+        doc = json.loads(output_text)
+    except json.JSONDecodeError:
+        return output_text
+    if not isinstance(doc, dict) or not isinstance(doc.get("meta"), dict):
+        return output_text
+
+    doc["meta"]["model"] = model
+    doc["meta"]["routing"] = routing
+    return json.dumps(doc, ensure_ascii=False)
+
+
 def run_prompt_over_reports(
     prompt_filename: str,
     status: str,
     pdf_paths,  # passed in by caller
     user_input: str | None = None,
+    mode: str = "individual",  # compare | keywords | individual (selects the model route)
 ):
     prompt_text = load_prompt(prompt_filename)
-    file_ids = upload_pdfs(pdf_paths)
 
     if user_input:
         prompt_text = user_input.rstrip() + "\n\n" + prompt_text.lstrip()
 
+    file_ids = upload_pdfs(pdf_paths)
+    decision = choose_model(mode, pdf_paths, prompt_text)
+
     content = [{"type": "input_file", "file_id": fid} for fid in file_ids]
     content.append({"type": "input_text", "text": prompt_text})
 
     print(status)
+    print(f"Using model {decision.model} ({decision.reason}).")
 
     system_text = """
 ABSOLUTE RULES:
@@ -67,26 +90,38 @@ Use replacements: "quotes", 'apostrophe', "...", "-", "CO2".
 - If unsure how to format something, use a "p" block (never invent new block types).
 """.strip()
 
-    response = client.responses.create(
-        model="gpt-5",
-        input=[
-            {"role": "system", "content": [{"type": "input_text", "text": system_text}]},
-            {"role": "user", "content": content},
-        ],
-    )
-    return response.output_text
+    start_call(decision.model)
+    started = time.perf_counter()
+    elapsed = None
+    try:
+        response = client.responses.create(
+            model=decision.model,
+            input=[
+                {"role": "system", "content": [{"type": "input_text", "text": system_text}]},
+                {"role": "user", "content": content},
+            ],
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        finish_call(mode, decision.model, elapsed, decision.estimated_tokens)
+
+    return _record_model(response.output_text, decision.model, routing_meta(decision, elapsed))
 
 
 # Convenience wrappers now REQUIRE pdf_paths
 def compare_reports(pdf_paths):
-    return run_prompt_over_reports("CompareReports.txt", "Comparing reports...", pdf_paths)
+    return run_prompt_over_reports(
+        "CompareReports.txt", "Comparing reports...", pdf_paths, mode="compare"
+    )
 
 
 def keyword_analysis(pdf_paths, user_input: str):
     return run_prompt_over_reports(
-        "KeyWordAnalysis.txt", "Running keyword analysis...", pdf_paths, user_input
+        "KeyWordAnalysis.txt", "Running keyword analysis...", pdf_paths, user_input, mode="keywords"
     )
 
 
 def individual_analysis(pdf_paths):
-    return run_prompt_over_reports("IndividualAnalysis.txt", "Running individual analyses...", pdf_paths)
+    return run_prompt_over_reports(
+        "IndividualAnalysis.txt", "Running individual analyses...", pdf_paths, mode="individual"
+    )
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import PdfObject
+
+from services.analysis_client import (
+    BASE_DIR,
+    individual_analysis,
+    load_prompt,
+    run_prompt_over_reports,
+)
+from services.json_cache import read_json, write_json_atomic
+from services.json_to_pdf_via_latex import SchemaError, validate_doc
+from services.model_router import ROUTES
+
+INDIVIDUAL_PROMPT = "IndividualAnalysis.txt"
+EXTRACTION_PROMPT = "PageExtraction.txt"
+
+# Page notes are content-addressed (keyed by page fingerprint), so identical
+# pages are reused across revisions, quarters and files. Whole-report analyses
+# are keyed by the exact PDF bytes, so they are only reused for the same file.
+CACHE_DIR = BASE_DIR / "cache" / "individual"
+PAGES_DIR = CACHE_DIR / "pages"
+ANALYSES_DIR = CACHE_DIR / "analyses"
+
+# Pages per extraction call, and how many extraction calls run at once.
+EXTRACTION_BATCH_PAGES = 8
+EXTRACTION_WORKERS = 4
+
+# Extraction only feeds future runs, so it runs after the analysis has been
+# returned. Worker threads are joined at interpreter exit, so a CLI run still
+# finishes its extractions before the process ends.
+_extraction_pool = ThreadPoolExecutor(
+    max_workers=EXTRACTION_WORKERS, thread_name_prefix="page_extraction"
+)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _stream_data(obj: PdfObject) -> bytes:
+    try:
+        return obj.get_data()
+    except Exception:
+        # Unsupported filters (e.g. JBIG2): the raw encoded bytes still identify the image.
+        return getattr(obj, "_data", b"") or b""
+
+
+def _xobject_digests(resources: Any, depth: int = 0) -> List[bytes]:
+    if resources is None or depth > 3:
+        return []
+    xobjects = resources.get_object().get("/XObject")
+    if xobjects is None:
+        return []
+    xobjects = xobjects.get_object()
+
+    digests: List[bytes] = []
+    for name in sorted(xobjects):
+        obj = xobjects[name].get_object()
+        digests.append(hashlib.sha256(_stream_data(obj)).digest())
+        if obj.get("/Subtype") == "/Form":
+            digests.extend(_xobject_digests(obj.get("/Resources"), depth + 1))
+    return digests
+
+
+def page_fingerprint(page: Any) -> str:
+    """
+    Fingerprint a page by its text, its content stream and every image or
+    form it draws. Text alone misses scanned, image-only and chart-only pages,
+    which would all hash alike and hide changes to images.
+    """
+    h = hashlib.sha256()
+    h.update(" ".join((page.extract_text() or "").split()).encode("utf-8"))
+    contents = page.get_contents()
+    if contents is not None:
+        h.update(b"\0" + _stream_data(contents))
+    for digest in _xobject_digests(page.get("/Resources")):
+        h.update(digest)
+    return h.hexdigest()
+
+
+def _page_ranges(pages: List[int]) -> str:
+    # [1, 2, 3, 7] -> "1-3, 7" (sorted page numbers).
+    ranges: List[str] = []
+    start = prev = pages[0]
+    for p in pages[1:] + [None]:
+        if p is not None and p == prev + 1:
+            prev = p
+            continue
+        ranges.append(f"{start}-{prev}" if start != prev else str(start))
+        if p is not None:
+            start = prev = p
+    return ", ".join(ranges)
+
+
+def _block_lines(b: Dict[str, Any]) -> List[str]:
+    t = b["type"]
+    if t in ("h1", "h2", "h3"):
+        return [f"## {b['text']}"]
+    if t == "p":
+        return [b["text"]]
+    if t in ("bullets", "numbered"):
+        return [f"- {x}" for x in b["items"]]
+    if t == "table":
+        return [" | ".join(b["columns"])] + [" | ".join(r) for r in b["rows"]]
+    return []
+
+
+def _parse_page_notes(json_text: str, page_numbers: List[int]) -> Dict[int, str]:
+    label = _page_ranges(page_numbers)
+    try:
+        doc = json.loads(json_text)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Model output for pages {label} was not valid JSON.\n{e}")
+    try:
+        if not isinstance(doc, dict):
+            raise SchemaError("Top-level JSON must be an object")
+        validate_doc(doc)
+    except SchemaError as e:
+        raise RuntimeError(f"Model output for pages {label} did not match the schema.\n{e}")
+
+    # Each page starts with an h1 "Page <n>"; pages the model skipped are
+    # left out, so they are not cached and get extracted again next time.
+    notes: Dict[int, List[str]] = {}
+    current = None
+    for b in doc["blocks"]:
+        if b["type"] == "h1":
+            m = re.fullmatch(r"\s*page\s+(\d+)\s*", b["text"], re.IGNORECASE)
+            current = int(m.group(1)) if m and int(m.group(1)) in page_numbers else None
+            if current is not None:
+                notes.setdefault(current, [])
+            continue
+        if current is not None:
+            notes[current].extend(_block_lines(b))
+    return {n: "\n".join(lines) for n, lines in notes.items()}
+
+
+def _page_note_path(extraction_hash: str, fingerprint: str) -> Path:
+    return PAGES_DIR / f"{_sha256(extraction_hash + fingerprint)}.json"
+
+
+def _write_pages_pdf(reader: PdfReader, pages: List[int], dst: Path) -> Path:
+    writer = PdfWriter()
+    for i in pages:
+        writer.add_page(reader.pages[i])
+    with dst.open("wb") as f:
+        writer.write(f)
+    return dst
+
+
+def _extract_batch(batch_pdf: Path, page_numbers: List[int], fingerprints: List[str],
+                   extraction_hash: str) -> None:
+    try:
+        json_text = run_prompt_over_reports(
+            EXTRACTION_PROMPT,
+            f"Extracting pages {_page_ranges(page_numbers)}...",
+            [batch_pdf],
+            "PAGES IN THIS PDF:\n"
+            f"- The attached PDF contains report pages {', '.join(map(str, page_numbers))}, "
+            "in this order.\n"
+            "- Start each page with an h1 block \"Page <n>\" using these report page numbers.\n",
+            mode="extraction",
+        )
+        notes = _parse_page_notes(json_text, page_numbers)
+        for n, fp in zip(page_numbers, fingerprints):
+            if n in notes:
+                write_json_atomic(_page_note_path(extraction_hash, fp), {"notes": notes[n]})
+    finally:
+        shutil.rmtree(batch_pdf.parent, ignore_errors=True)
+
+
+def _report_extraction_error(future: Future) -> None:
+    e = future.exception()
+    if e is not None:
+        print(f"Page extraction failed; those pages will be re-sent next run.\n{e}")
+
+
+def _schedule_extraction(reader: PdfReader, pages: List[int], fingerprints: List[str],
+                         extraction_hash: str) -> None:
+    # Identical pages (repeated boilerplate, blank pages) are extracted once.
+    unique: Dict[str, int] = {}
+    for i in pages:
+        unique.setdefault(fingerprints[i], i)
+    todo = sorted(unique.values())
+
+    for start in range(0, len(todo), EXTRACTION_BATCH_PAGES):
+        batch = todo[start:start + EXTRACTION_BATCH_PAGES]
+        # Write the batch PDF now: the caller may delete the source PDF
+        # (the API removes uploads) before the extraction runs.
+        tmp = Path(tempfile.mkdtemp(prefix="page_extraction_"))
+        batch_pdf = _write_pages_pdf(reader, batch, tmp / "pages.pdf")
+        future = _extraction_pool.submit(
+            _extract_batch, batch_pdf, [i + 1 for i in batch],
+            [fingerprints[i] for i in batch], extraction_hash,
+        )
+        future.add_done_callback(_report_extraction_error)
+
+
+def _synthesis_preface(changed: List[int], unchanged: List[int], notes: Dict[str, str],
+                       fingerprints: List[str]) -> str:
+    parts = [
+        "INCREMENTAL RE-ANALYSIS:",
+        f"- The report has {len(fingerprints)} pages. The attached PDF contains ONLY pages "
+        f"{_page_ranges([i + 1 for i in changed])}, which changed since a previous run.",
+        "- The remaining pages are unchanged. Their content is given below as notes "
+        "extracted from this same report; treat the notes as stated in the report.",
+        "- Analyze the WHOLE report (attached pages plus notes) and produce the complete "
+        "required structure exactly as specified.",
+        "",
+        "NOTES FROM UNCHANGED PAGES:",
+    ]
+    for i in unchanged:
+        parts.extend([f"[Page {i + 1}]", notes[fingerprints[i]], ""])
+    return "\n".join(parts)
+
+
+def _served_from_cache(doc: Dict[str, Any]) -> str:
+    # Keep the original model for auditability, but make clear no call was made now.
+    routing = dict(doc["meta"].get("routing") or {})
+    routing["cache_hit"] = True
+    routing["observed_seconds"] = None
+    doc["meta"]["routing"] = routing
+    return json.dumps(doc, ensure_ascii=False)
+
+
+def individual_analysis_incremental(pdf_path) -> str:
+    """
+    Individual analysis that only sends changed pages to the model.
+
+    Each page is fingerprinted and looked up in a cache of page notes from
+    earlier runs. One analysis call gets the pages without notes as a PDF and
+    the notes of the others as text; with no notes at all it is a normal full
+    run. Notes for the new pages are extracted afterwards in the background,
+    for future runs. Returns JSON text, like individual_analysis.
+    """
+    pdf_path = Path(pdf_path)
+    if not pdf_path.exists():
+        raise FileNotFoundError(f"PDF does not exist: {pdf_path}")
+
+    # Prompt and model changes invalidate every cache entry derived from them.
+    primary_model = ROUTES["individual"].primary
+    extraction_hash = _sha256(load_prompt(EXTRACTION_PROMPT))
+    analysis_key = _sha256(
+        load_prompt(INDIVIDUAL_PROMPT) + extraction_hash + primary_model
+        + hashlib.sha256(pdf_path.read_bytes()).hexdigest()
+    )
+    analysis_path = ANALYSES_DIR / f"{analysis_key}.json"
+
+    cached_analysis = read_json(analysis_path)
+    if cached_analysis is not None and isinstance(cached_analysis.get("meta"), dict):
+        print(f"{pdf_path.name}: same file as a previous run, reusing its analysis.")
+        return _served_from_cache(cached_analysis)
+
+    reader = PdfReader(str(pdf_path))
+    fingerprints = [page_fingerprint(p) for p in reader.pages]
+
+    notes: Dict[str, str] = {}
+    for fp in set(fingerprints):
+        entry = read_json(_page_note_path(extraction_hash, fp))
+        if entry is not None and isinstance(entry.get("notes"), str):
+            notes[fp] = entry["notes"]
+
+    changed = [i for i, fp in enumerate(fingerprints) if fp not in notes]
+    unchanged = [i for i, fp in enumerate(fingerprints) if fp in notes]
+    print(f"{pdf_path.name}: {len(changed)} of {len(fingerprints)} pages changed.")
+
+    if not changed or not unchanged:
+        # Nothing to diff against, or every page is known but this exact file
+        # has no cached analysis: a normal full run.
+        json_text = individual_analysis([pdf_path])
+    else:
+        with tempfile.TemporaryDirectory(prefix="changed_pages_") as tmp:
+            json_text = run_prompt_over_reports(
+                INDIVIDUAL_PROMPT,
+                "Running incremental individual analysis...",
+                [_write_pages_pdf(reader, changed, Path(tmp) / "pages_changed.pdf")],
+                _synthesis_preface(changed, unchanged, notes, fingerprints),
+                mode="individual",
+            )
+
+    if changed:
+        print(f"Extracting {len(changed)} page(s) in the background for future runs.")
+        _schedule_extraction(reader, changed, fingerprints, extraction_hash)
+
+    try:
+        doc = json.loads(json_text)
+    except json.JSONDecodeError:
+        # Leave the raw text for the PDF writer to report; do not cache it.
+        return json_text
+    # Only cache primary-model results; a fallback answer should not outlive
+    # the slow period that caused it.
+    if isinstance(doc, dict) and isinstance(doc.get("meta"), dict) \
+            and doc["meta"].get("model") == primary_model:
+        write_json_atomic(analysis_path, doc)
+    return json_text
@@ -125,6 +125,147 @@ LATEX_PREAMBLE = r"""
 \begin{document}
 """
 
+# Tables above these sizes skip xltabular: its X columns re-typeset the whole
+# body until the widths settle, which gets slow (and can run out of TeX
+# memory) for long or wide tables.
+LARGE_TABLE_ROWS = 60
+LARGE_TABLE_COLS = 8
+LARGE_TABLE_CELLS = 600
+
+# Large tables use one longtable with fixed p{} widths; longtable repeats the
+# header at real page breaks. LTchunksize is how many rows longtable collects
+# before setting them: higher is faster but holds more rows in TeX memory.
+# 20 is longtable's own default; --bench-tables also times other values.
+LT_CHUNK_SIZE = 20
+
+# Narrowest usable column. Tables with more columns than fit at this width
+# are split into several tables over column groups, each repeating column 1.
+MIN_COL_FRACTION = 0.08
+MAX_TABLE_COLS = int(1 / MIN_COL_FRACTION)
+
+
+def _is_large_table(cols: List[str], rows: List[List[str]]) -> bool:
+    return (
+        len(rows) > LARGE_TABLE_ROWS
+        or len(cols) > LARGE_TABLE_COLS
+        or len(rows) * len(cols) > LARGE_TABLE_CELLS
+    )
+
+
+def _table_rows_tex(cols: List[str], rows: List[List[str]]) -> Tuple[str, str]:
+    header = " & ".join(latex_escape(c) for c in cols) + r" \\"
+    body = "\n".join(
+        " & ".join(latex_escape(cell) for cell in r) + r" \\"
+        for r in rows
+    )
+    return header, body
+
+
+def _table_head_foot(header: str, n: int) -> List[str]:
+    return [
+        r"\toprule",
+        header,
+        r"\midrule",
+        r"\endfirsthead",
+        r"\toprule",
+        header,
+        r"\midrule",
+        r"\endhead",
+        r"\midrule",
+        r"\multicolumn{" + str(n) + r"}{c}{\small \textbf{Continued on next page}} \\",
+        r"\midrule",
+        r"\endfoot",
+        r"\bottomrule",
+        r"\endlastfoot",
+    ]
+
+
+def _render_xltabular(cols: List[str], rows: List[List[str]]) -> str:
+    n = len(cols)
+    header, body = _table_rows_tex(cols, rows)
+
+    # Column spec:
+    # - first column is left-aligned and can wrap a bit
+    # - remaining columns are X (auto-width + wrap)
+    if n == 1:
+        colspec = r">{\raggedright\arraybackslash}p{\textwidth}"
+    else:
+        colspec = r">{\raggedright\arraybackslash}p{0.18\textwidth} " + " ".join(
+            [r">{\raggedright\arraybackslash}X" for _ in range(n - 1)]
+        )
+
+    return "\n".join([
+        r"\begingroup\small",
+        r"\setlength{\LTpre}{0pt}",
+        r"\setlength{\LTpost}{0pt}",
+        r"\begin{xltabular}{\textwidth}{" + colspec + r"}",
+        *_table_head_foot(header, n),
+        body,
+        r"\end{xltabular}",
+        r"\endgroup",
+        "",
+    ])
+
+
+def _fixed_colspec(n: int) -> str:
+    # Fixed p{} widths are known up front, so longtable typesets each row once.
+    # Wide tables share the width evenly; otherwise the first column keeps 18%.
+    # Callers keep n <= MAX_TABLE_COLS, so no column drops below MIN_COL_FRACTION.
+    if n == 1:
+        fractions = [1.0]
+    elif n > LARGE_TABLE_COLS:
+        fractions = [1.0 / n] * n
+    else:
+        fractions = [0.18] + [0.82 / (n - 1)] * (n - 1)
+
+    return " ".join(
+        r">{\raggedright\arraybackslash}p{\dimexpr " + f"{f:.4f}" + r"\textwidth-2\tabcolsep\relax}"
+        for f in fractions
+    )
+
+
+def _render_longtable(cols: List[str], rows: List[List[str]], chunk_size: int = LT_CHUNK_SIZE) -> str:
+    n = len(cols)
+    header, body = _table_rows_tex(cols, rows)
+    size = r"\scriptsize" if n > LARGE_TABLE_COLS else r"\small"
+
+    # \setcounter is global, so the group does not scope it: save the current
+    # value and put it back after the table.
+    return "\n".join([
+        r"\begingroup" + size,
+        r"\setlength{\LTpre}{0pt}",
+        r"\setlength{\LTpost}{0pt}",
+        r"\edef\LTprevchunksize{\arabic{LTchunksize}}",
+        r"\setcounter{LTchunksize}{" + str(chunk_size) + r"}",
+        r"\begin{longtable}{" + _fixed_colspec(n) + r"}",
+        *_table_head_foot(header, n),
+        body,
+        r"\end{longtable}",
+        r"\setcounter{LTchunksize}{\LTprevchunksize}",
+        r"\endgroup",
+        "",
+    ])
+
+
+def _render_large_table(cols: List[str], rows: List[List[str]], chunk_size: int = LT_CHUNK_SIZE) -> str:
+    n = len(cols)
+    if n <= MAX_TABLE_COLS:
+        return _render_longtable(cols, rows, chunk_size)
+
+    # Too wide for one table: split the remaining columns into groups and
+    # repeat the first (label) column in each part.
+    step = MAX_TABLE_COLS - 1
+    parts: List[str] = []
+    for start in range(1, n, step):
+        idx = [0] + list(range(start, min(start + step, n)))
+        note = f"Columns {start + 1}-{idx[-1] + 1} of {n}"
+        parts.append(f"\\noindent\\textit{{\\small {note}}}\n\n")
+        parts.append(_render_longtable(
+            [cols[i] for i in idx], [[r[i] for i in idx] for r in rows], chunk_size
+        ))
+    return "\n".join(parts)
+
+
 def render_block(b: Dict[str, Any]) -> str:
     t = b["type"]
 
@@ -153,50 +294,10 @@ def render_block(b: Dict[str, Any]) -> str:
         rows: List[List[str]] = b["rows"]
         caption: Optional[str] = b.get("caption")
 
-        n = len(cols)
-
-        header = " & ".join(latex_escape(c) for c in cols) + r" \\"
-        body = "\n".join(
-            " & ".join(latex_escape(cell) for cell in r) + r" \\"
-            for r in rows
-        )
-
-        # Column spec:
-        # - first column is left-aligned and can wrap a bit
-        # - remaining columns are X (auto-width + wrap)
-        if n == 1:
-            colspec = r">{\raggedright\arraybackslash}p{\textwidth}"
+        if _is_large_table(cols, rows):
+            table_tex = _render_large_table(cols, rows)
         else:
-            colspec = r">{\raggedright\arraybackslash}p{0.18\textwidth} " + " ".join(
-                [r">{\raggedright\arraybackslash}X" for _ in range(n - 1)]
-            )
-
-        table_tex = "\n".join([
-            r"\begingroup\small",
-            r"\setlength{\LTpre}{0pt}",
-            r"\setlength{\LTpost}{0pt}",
-            r"\begin{xltabular}{\textwidth}{" + colspec + r"}",
-            r"\toprule",
-            header,
-            r"\midrule",
-            r"\endfirsthead",
-            r"\toprule",
-            header,
-            r"\midrule",
-            r"\endhead",
-            r"\midrule",
-            r"\multicolumn{" + str(n) + r"}{c}{\small \textbf{Continued on next page}} \\",
-            r"\midrule",
-            r"\endfoot",
-            r"\bottomrule",
-            r"\endlastfoot",
-            body,
-            r"\end{xltabular}",
-            r"\endgroup",
-            "",
-        ])
-
-
+            table_tex = _render_xltabular(cols, rows)
 
         if caption:
             return f"\\textbf{{{latex_escape(caption)}}}\n\n{table_tex}\n"
@@ -306,6 +407,49 @@ def write_pdf_from_json_text(
     return pdf_path
 
 
+def benchmark_table_compile(
+    row_counts: Sequence[int] = (20, 60, 100, 300, 1000),
+    col_counts: Sequence[int] = (5, 10, 30),
+    chunk_sizes: Sequence[int] = (20, 100),
+    out_root: Path = Path("./out/bench_tables"),
+    engine: str = "pdflatex",
+) -> List[Tuple[int, int, Dict[str, Optional[float]]]]:
+    """
+    Time compilation of one synthetic table per (rows, columns) size in each
+    rendering: a single xltabular (previous behaviour), the fixed-width
+    longtable path at each LTchunksize, and render_block (what ships).
+    Comparing xltabular with longtable per size is what the LARGE_TABLE_*
+    thresholds should be set from. A time is None if that variant failed.
+    """
+    import time
+
+    out_root.mkdir(parents=True, exist_ok=True)
+    results: List[Tuple[int, int, Dict[str, Optional[float]]]] = []
+
+    for n_cols in col_counts:
+        cols = [f"Column {j + 1}" for j in range(n_cols)]
+        for n_rows in row_counts:
+            rows = [[f"Row {i + 1} value {j + 1}" for j in range(n_cols)] for i in range(n_rows)]
+            variants = {"xltabular": _render_xltabular(cols, rows)}
+            for k in chunk_sizes:
+                variants[f"longtable@{k}"] = _render_large_table(cols, rows, chunk_size=k)
+            variants["render_block"] = render_block({"type": "table", "columns": cols, "rows": rows})
+
+            timings: Dict[str, Optional[float]] = {}
+            for name, table_tex in variants.items():
+                tex_path = out_root / f"table_{n_rows}x{n_cols}_{name.replace('@', '_')}.tex"
+                tex_path.write_text(LATEX_PREAMBLE + table_tex + "\n\\end{document}\n", encoding="utf-8")
+                start = time.perf_counter()
+                try:
+                    compile_pdf(tex_path, engine=engine)
+                except RuntimeError:
+                    timings[name] = None
+                    continue
+                timings[name] = time.perf_counter() - start
+
+            results.append((n_rows, n_cols, timings))
+    return results
+
 
 def main() -> None:
     import argparse
@@ -317,8 +461,24 @@ def main() -> None:
     ap.add_argument("--tex-out", type=Path, default=None)
     ap.add_argument("--pdf", action="store_true", help="Compile to PDF")
     ap.add_argument("--engine", choices=["tectonic", "pdflatex"], default="tectonic")
+    ap.add_argument(
+        "--bench-tables",
+        action="store_true",
+        help="Benchmark table compile time against row and column count and exit",
+    )
     args = ap.parse_args()
 
+    if args.bench_tables:
+        def fmt(t: Optional[float], width: int) -> str:
+            return f"{t:>{width}.2f}" if t is not None else f"{'failed':>{width}}"
+
+        results = benchmark_table_compile(engine=args.engine)
+        names = list(results[0][2])
+        print(f"{'rows':>6} {'cols':>5} " + " ".join(f"{n + ' (s)':>17}" for n in names))
+        for n_rows, n_cols, timings in results:
+            print(f"{n_rows:>6} {n_cols:>5} " + " ".join(fmt(timings[n], 17) for n in names))
+        return
+
     json_path: Path = args.json_file
     if not json_path.exists():
         raise FileNotFoundError(f"JSON file not found: {json_path.resolve()}")
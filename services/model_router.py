@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import statistics
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
+
+from services.json_cache import read_json, write_json_atomic
+
+# Project root is one level above /services
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Observed [timestamp, seconds, estimated tokens] per mode and model, persisted
+# across runs: {"<mode>": {"<model>": [[ts, seconds, tokens], ...]}}.
+# Output length differs a lot between modes, so their rates are kept apart.
+LATENCY_HISTORY_PATH = BASE_DIR / "cache" / "model_latency.json"
+LATENCY_HISTORY_SIZE = 50
+
+# Samples older than this are ignored, so a slow period does not stick.
+LATENCY_SAMPLE_MAX_AGE_SECONDS = 24 * 3600
+
+# When the primary has been skipped and its newest sample is older than
+# this, the next call goes to the primary anyway to refresh its history.
+PRIMARY_PROBE_INTERVAL_SECONDS = 3600
+
+# Rough input size estimate: report pages are dense, prompt text is ~4 chars/token.
+TOKENS_PER_PAGE = 800
+CHARS_PER_TOKEN = 4
+
+# Page-count fallback for PDFs pypdf cannot parse (encrypted, malformed).
+BYTES_PER_PAGE = 100_000
+
+
+@dataclass(frozen=True)
+class Route:
+    primary: str
+    fallback: str
+    slo_seconds: float
+    # Inputs at or below this estimate go straight to the fallback model.
+    small_input_tokens: int = 0
+
+
+# Per-mode routes. SLOs can be overridden with ANALYSIS_SLO_SECONDS_<MODE>,
+# e.g. ANALYSIS_SLO_SECONDS_KEYWORDS=120.
+ROUTES: Dict[str, Route] = {
+    "compare": Route(primary="gpt-5", fallback="gpt-5-mini", slo_seconds=900),
+    "keywords": Route(
+        primary="gpt-5", fallback="gpt-5-mini", slo_seconds=300, small_input_tokens=8_000
+    ),
+    "individual": Route(primary="gpt-5", fallback="gpt-5-mini", slo_seconds=600),
+    # Page fact extraction for incremental re-analysis: short outputs, kept
+    # apart from full analyses so their latency history does not mix.
+    "extraction": Route(primary="gpt-5", fallback="gpt-5-mini", slo_seconds=300),
+}
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    mode: str
+    model: str
+    reason: str
+    pages: int
+    estimated_tokens: int
+    slo_seconds: float
+    predicted_seconds: Optional[float]
+
+
+_lock = threading.Lock()
+_in_flight: Dict[str, int] = {}
+
+
+def _slo_seconds(mode: str, route: Route) -> float:
+    raw = os.environ.get(f"ANALYSIS_SLO_SECONDS_{mode.upper()}")
+    if not raw:
+        return route.slo_seconds
+    try:
+        return float(raw)
+    except ValueError:
+        raise ValueError(f"ANALYSIS_SLO_SECONDS_{mode.upper()} must be a number, got {raw!r}")
+
+
+def _count_pdf_pages(path: Path) -> int:
+    try:
+        return len(PdfReader(str(path)).pages)
+    except (PdfReadError, ValueError, KeyError, TypeError):
+        # Only a size estimate: never let an unparseable PDF abort the
+        # analysis, the upload already accepted it.
+        return max(1, path.stat().st_size // BYTES_PER_PAGE)
+
+
+def count_pages(pdf_paths) -> int:
+    return sum(_count_pdf_pages(Path(p)) for p in pdf_paths)
+
+
+def estimate_tokens(pages: int, prompt_text: str) -> int:
+    return pages * TOKENS_PER_PAGE + len(prompt_text) // CHARS_PER_TOKEN
+
+
+def _load_history() -> Dict[str, Any]:
+    return read_json(LATENCY_HISTORY_PATH) or {}
+
+
+def _samples(history: Dict[str, Any], mode: str, model: str) -> List[List[float]]:
+    # Keep only well-formed [ts, seconds, tokens] entries; anything else in the
+    # file (hand edits, older formats) is treated as missing history.
+    by_model = history.get(mode)
+    entries = by_model.get(model) if isinstance(by_model, dict) else None
+    if not isinstance(entries, list):
+        return []
+    return [
+        e for e in entries
+        if isinstance(e, list) and len(e) == 3
+        and all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in e)
+    ]
+
+
+def _recent_samples(mode: str, model: str) -> List[List[float]]:
+    cutoff = time.time() - LATENCY_SAMPLE_MAX_AGE_SECONDS
+    with _lock:
+        samples = _samples(_load_history(), mode, model)
+    return [e for e in samples if e[0] >= cutoff]
+
+
+def predict_seconds(mode: str, model: str, estimated_tokens: int) -> Optional[float]:
+    """
+    Predict latency from the median seconds per token of recent calls in this
+    mode, scaled by the number of calls already in flight for the model.
+    None if there are no recent samples.
+    """
+    rates = [s / t for _, s, t in _recent_samples(mode, model) if t > 0]
+    if not rates:
+        return None
+    with _lock:
+        queued = _in_flight.get(model, 0)
+    return statistics.median(rates) * estimated_tokens * (1 + queued)
+
+
+def _probe_due(mode: str, model: str) -> bool:
+    samples = _recent_samples(mode, model)
+    newest = max((e[0] for e in samples), default=0.0)
+    return time.time() - newest >= PRIMARY_PROBE_INTERVAL_SECONDS
+
+
+def choose_model(mode: str, pdf_paths, prompt_text: str) -> RoutingDecision:
+    if mode not in ROUTES:
+        raise ValueError(f"No model route for mode: {mode}")
+
+    route = ROUTES[mode]
+    slo = _slo_seconds(mode, route)
+    pages = count_pages(pdf_paths)
+    tokens = estimate_tokens(pages, prompt_text)
+
+    def decide(model: str, reason: str, predicted: Optional[float]) -> RoutingDecision:
+        return RoutingDecision(mode, model, reason, pages, tokens, slo, predicted)
+
+    if tokens <= route.small_input_tokens:
+        return decide(route.fallback, "small input", predict_seconds(mode, route.fallback, tokens))
+
+    predicted = predict_seconds(mode, route.primary, tokens)
+    if predicted is None:
+        return decide(route.primary, "no recent latency history", None)
+    if predicted <= slo:
+        return decide(route.primary, "within SLO", predicted)
+    if _probe_due(mode, route.primary):
+        return decide(route.primary, "probe: primary over SLO but history is stale", predicted)
+
+    fallback_predicted = predict_seconds(mode, route.fallback, tokens)
+    return decide(route.fallback, "primary predicted over SLO", fallback_predicted)
+
+
+def start_call(model: str) -> None:
+    with _lock:
+        _in_flight[model] = _in_flight.get(model, 0) + 1
+
+
+def finish_call(mode: str, model: str, seconds: Optional[float], estimated_tokens: int) -> None:
+    """
+    Mark a call as done and, if it succeeded (seconds is not None), add its
+    latency to the (mode, model) history.
+    """
+    with _lock:
+        _in_flight[model] = max(_in_flight.get(model, 1) - 1, 0)
+        if seconds is None:
+            return
+
+        history = _load_history()
+        samples = _samples(history, mode, model)
+        samples.append([round(time.time(), 1), round(seconds, 3), estimated_tokens])
+        del samples[:-LATENCY_HISTORY_SIZE]
+
+        by_model = history.get(mode)
+        if not isinstance(by_model, dict):
+            by_model = history[mode] = {}
+        by_model[model] = samples
+
+        write_json_atomic(LATENCY_HISTORY_PATH, history)
+
+
+def routing_meta(decision: RoutingDecision, observed_seconds: float) -> Dict[str, object]:
+    meta = asdict(decision)
+    del meta["model"]  # recorded as meta["model"] on the document itself
+    meta["observed_seconds"] = round(observed_seconds, 1)
+    if meta["predicted_seconds"] is not None:
+        meta["predicted_seconds"] = round(meta["predicted_seconds"], 1)
+    return meta